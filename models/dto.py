@@ -1,13 +1,27 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Union, Literal
+from typing_extensions import TypedDict, Annotated
 from datetime import date
 
-class FileData(BaseModel):
-    data: Union[bytes, str]  # Can be bytes or base64 string
+class BytesFileData(BaseModel):
+    kind: Literal['bytes']
+    data: bytes
     originalname: str
     mimetype: str
     size: int
 
+class Base64FileData(BaseModel):
+    kind: Literal['b64']
+    data: str  # base64 string
+    originalname: str
+    mimetype: str
+    size: int
+
+# Discriminated union: pydantic-core picks the right variant in O(1) via the
+# kind tag instead of attempting each member in turn. The NestJS backend tags
+# every upload with the form it sends.
+FileData = Annotated[Union[BytesFileData, Base64FileData], Field(discriminator='kind')]
+
 class ComprehendRequest(BaseModel):
     file: FileData
     doctor_id: str
@@ -21,36 +35,41 @@ class BillRequest(BaseModel):
     doctor_id: str
     clinic_id: int
 
-class TaperingDto(BaseModel):
+# Leaf structures are TypedDicts rather than nested BaseModels: each nested
+# model would carry its own SchemaValidator/SchemaSerializer and validating a
+# medication would recurse through all of them. ValidationService fills in
+# missing keys with its defaults, so total=False is safe here.
+
+class TaperingDto(TypedDict, total=False):
     frequency: str
     days: int
     comments: str
 
-class FoodDto(BaseModel):
-    before_breakfast: bool = False
-    after_breakfast: bool = False
-    lunch: bool = False
-    dinner: bool = False
-
-class FrequencyDto(BaseModel):
-    od: bool = False
-    bid: bool = False
-    tid: bool = False
-    qid: bool = False
-    hs: bool = False
-    ac: bool = False
-    pc: bool = False
-    qam: bool = False
-    qpm: bool = False
-    bs: bool = False
-    q6h: bool = False
-    q8h: bool = False
-    q12h: bool = False
-    qod: bool = False
-    q1w: bool = False
-    q2w: bool = False
-    q3w: bool = False
-    q1m: bool = False
+class FoodDto(TypedDict, total=False):
+    before_breakfast: bool
+    after_breakfast: bool
+    lunch: bool
+    dinner: bool
+
+class FrequencyDto(TypedDict, total=False):
+    od: bool
+    bid: bool
+    tid: bool
+    qid: bool
+    hs: bool
+    ac: bool
+    pc: bool
+    qam: bool
+    qpm: bool
+    bs: bool
+    q6h: bool
+    q8h: bool
+    q12h: bool
+    qod: bool
+    q1w: bool
+    q2w: bool
+    q3w: bool
+    q1m: bool
 
 class MedicationDto(BaseModel):
     medicine_name: str
@@ -1,40 +1,118 @@
+import io
 import os
-import json
 import base64
 import time
+import asyncio
 import logging
 from typing import Optional
 
+import orjson
 import google.generativeai as genai
+from google.generativeai.types import content_types
 from models.dto import ComprehendRequest, ComprehendResponse, AIProcessingResult, ErrorDetails, BillRequest, BillResponse
 from services.firebase_service import FirebaseService
 from services.validation_service import ValidationService
 
 logger = logging.getLogger(__name__)
 
+def _extract_json(response: str) -> str:
+    """Slice the markdown code fences off a Gemini response.
+
+    The fences occupy <20 bytes at each end of a response that can be tens of
+    KB, so slicing beats any substitution that rebuilds the whole string.
+    orjson tolerates the surrounding whitespace left behind.
+    """
+    i = 0
+    j = len(response)
+    # Gemini sometimes leads with a newline before the fence
+    while i < j and response[i].isspace():
+        i += 1
+    if response.startswith('```', i):
+        i += 3
+        if response[i:i + 4].lower() == 'json':
+            i += 4
+    else:
+        i = 0
+    if response.endswith('```'):
+        j -= 3
+    else:
+        k = response.rfind('```')
+        if k > i and response[k + 3:].isspace():
+            j = k
+    return response[i:j]
+
+# Above this size, stream the raw bytes through the Gemini Files API instead
+# of inlining base64 (which inflates the payload ~33% in RAM and on the wire)
+_INLINE_MAX = 2 * 1024 * 1024
+
+# Above this size, base64 work is pushed off the event loop - below it the
+# thread-dispatch overhead outweighs the win
+_B64_OFFLOAD_MIN = 64 * 1024
+
+# Shared generation config for both prescription and bill models
+_GEN_CFG = {
+    "max_output_tokens": 8192,
+    "temperature": 0,
+    "top_p": 0.95
+}
+
+# Known mimetypes from the NestJS backend - exact-match set lookup first,
+# startswith only as a fallback for unusual but valid subtypes
+_IMAGE_MIMES = frozenset({
+    'image/jpeg', 'image/png', 'image/webp', 'image/heic', 'image/heif',
+    'application/pdf'
+})
+_AUDIO_MIMES = frozenset({
+    'audio/mpeg', 'audio/wav', 'audio/m4a', 'audio/ogg', 'audio/webm',
+    'audio/flac'
+})
+
+# Gemini configuration, read from the environment once at import time
+# (main.py loads .env before importing this module)
+_API_KEY = os.environ.get("GEMINI_GEN_AI_API_KEY")
+_BILL_MODEL = os.environ.get("GEMINI_BILL_MODEL")
+_PRESCRIPTION_MODEL = os.environ.get("GEMINI_PRESCRIPTION_MODEL")
+_BILL_PROMPT = os.environ.get("GEMINI_BILL_PROMPT")
+_PRESCRIPTION_PROMPT = os.environ.get("GEMINI_PRESCRIPTION_PROMPT")
+
 class ComprehendService:
     def __init__(self, firebase_service: FirebaseService, validation_service: ValidationService):
         self.firebase_service = firebase_service
         self.validation_service = validation_service
         
         # Initialize Gemini AI
-        api_key = os.getenv("GEMINI_GEN_AI_API_KEY")
-        bill_model = os.getenv("GEMINI_BILL_MODEL")
-        prescription_model = os.getenv("GEMINI_PRESCRIPTION_MODEL")
-        bill_prompt = os.getenv("GEMINI_BILL_PROMPT")
-        prescription_prompt = os.getenv("GEMINI_PRESCRIPTION_PROMPT")
-        
-        if not api_key or not bill_model or not prescription_model or not bill_prompt or not prescription_prompt:
+        if not _API_KEY or not _BILL_MODEL or not _PRESCRIPTION_MODEL or not _BILL_PROMPT or not _PRESCRIPTION_PROMPT:
             raise ValueError("Environment variables not configured")
-        
-        genai.configure(api_key=api_key)
-        
-        self.prescription_model = prescription_model
-        self.bill_model = bill_model
-        self.prescription_prompt = prescription_prompt
-        self.bill_prompt = bill_prompt
-        
-        logger.info(f"Initialized ComprehendService with prescription model: {self.prescription_model}, bill model: {self.bill_model}")
+
+        genai.configure(api_key=_API_KEY)
+
+        self.prescription_model = _PRESCRIPTION_MODEL
+        self.bill_model = _BILL_MODEL
+        self.prescription_prompt = _PRESCRIPTION_PROMPT
+        self.bill_prompt = _BILL_PROMPT
+
+        # Build the model handles once - constructing a GenerativeModel per
+        # request re-resolves model metadata and allocates a fresh stub
+        self._rx_model = genai.GenerativeModel(
+            model_name=self.prescription_model,
+            generation_config=_GEN_CFG
+        )
+        # Deployments often point both workloads at the same model - share
+        # the handle (and its stub) rather than duplicating it
+        if self.bill_model == self.prescription_model:
+            self._bill_model = self._rx_model
+        else:
+            self._bill_model = genai.GenerativeModel(
+                model_name=self.bill_model,
+                generation_config=_GEN_CFG
+            )
+
+        # The prompt strings never change - convert them to SDK Parts once
+        # instead of paying the str->Part conversion on every request
+        self._rx_prompt_part = content_types.to_part(_PRESCRIPTION_PROMPT)
+        self._bill_prompt_part = content_types.to_part(_BILL_PROMPT)
+
+        logger.info("Initialized ComprehendService with prescription model: %s, bill model: %s", self.prescription_model, self.bill_model)
 
     async def process_prescription_ai(self, request: ComprehendRequest) -> ComprehendResponse:
         """
@@ -42,44 +120,92 @@ class ComprehendService:
         Main NestJS backend handles DB save and error logging
         """
         file_url: Optional[str] = None
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            # Process file data
-            if isinstance(request.file.data, bytes):
+            # Process file data - Firebase needs raw bytes; Gemini needs either
+            # the base64 str (inline path) or the raw bytes (Files API path)
+            if request.file.kind == 'bytes':
                 file_content = request.file.data
-                base64_data = base64.b64encode(file_content).decode('utf-8')
+                base64_data = None
             else:
                 base64_data = request.file.data
-                file_content = base64.b64decode(base64_data)
-            
+                if len(base64_data) > _B64_OFFLOAD_MIN:
+                    # Decoding a multi-MB payload inline would block the event
+                    # loop for milliseconds - hand it to a worker thread
+                    file_content = await asyncio.to_thread(base64.b64decode, base64_data)
+                else:
+                    file_content = base64.b64decode(base64_data)
+
             # Determine file type and processing flags
             is_handwritten_rx = False
             is_voice_rx = False
-            
-            if (request.file.mimetype.startswith('image/') or 
-                request.file.mimetype == 'application/pdf'):
+            upload_ts = time.time_ns() // 1_000_000_000
+
+            mimetype = request.file.mimetype
+            if mimetype in _IMAGE_MIMES or mimetype.startswith('image/'):
                 is_handwritten_rx = True
-                file_path = f"image_prescription/{request.doctor_id}/{request.patient_id}/{int(time.time())}_{request.file.originalname}"
-            elif request.file.mimetype.startswith('audio/'):
+                file_path = f"image_prescription/{request.doctor_id}/{request.patient_id}/{upload_ts}_{request.file.originalname}"
+            elif mimetype in _AUDIO_MIMES or mimetype.startswith('audio/'):
                 is_voice_rx = True
-                file_path = f"audio_files/{request.doctor_id}/{request.patient_id}/{int(time.time())}_{request.file.originalname}"
+                file_path = f"audio_files/{request.doctor_id}/{request.patient_id}/{upload_ts}_{request.file.originalname}"
             else:
                 raise ValueError("Unsupported file type")
             
-            # Upload file to Firebase
-            upload_result = await self.firebase_service.upload_file(
+            # Firebase upload and Gemini generation hit disjoint backends and
+            # neither needs the other's result, so run them concurrently -
+            # this roughly halves end-to-end latency for image prescriptions
+            upload_task = asyncio.create_task(self.firebase_service.upload_file(
                 file_content=file_content,
                 file_path=file_path,
                 content_type=request.file.mimetype,
                 original_name=request.file.originalname
+            ))
+
+            if request.file.size > _INLINE_MAX:
+                # Large payloads go to the Files API as raw bytes, skipping
+                # the base64 inflation entirely
+                gen_task = asyncio.create_task(
+                    self._generate_content_via_files_api(
+                        self._rx_model, file_content, request.file.mimetype,
+                        self._rx_prompt_part
+                    )
+                )
+            else:
+                if base64_data is None:
+                    # base64 output is pure ASCII, decoding as ascii skips the utf-8 scan
+                    if len(file_content) > _B64_OFFLOAD_MIN:
+                        encoded = await asyncio.to_thread(base64.b64encode, file_content)
+                    else:
+                        encoded = base64.b64encode(memoryview(file_content))
+                    base64_data = encoded.decode('ascii')
+                file_data = {
+                    "mime_type": request.file.mimetype,
+                    "data": base64_data
+                }
+                gen_task = asyncio.create_task(
+                    self._generate_content_async(self._rx_model, file_data, self._rx_prompt_part)
+                )
+
+            # Raw bytes are no longer needed once the upload task holds them -
+            # drop our reference so GC can reclaim the buffer sooner
+            del file_content
+
+            upload_result, response = await asyncio.gather(
+                upload_task, gen_task, return_exceptions=True
             )
-            
+
+            if isinstance(upload_result, BaseException):
+                raise upload_result
+
             if not upload_result["success"]:
-                return ComprehendResponse(
+                # error paths are trusted internal data too, and they run
+                # exactly when the system is already under stress
+                return ComprehendResponse.model_construct(
                     success=False,
-                    processing_time=int((time.time() - start_time) * 1000),
-                    error=ErrorDetails(
+                    processing_time=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                    ai_result=None,
+                    error=ErrorDetails.model_construct(
                         message=f"Firebase upload failed: {upload_result['error']}",
                         type="FirebaseUploadError",
                         context={
@@ -93,53 +219,40 @@ class ComprehendService:
                 )
             
             file_url = upload_result["url"]
-            
-            # Process with Gemini AI
-            model = genai.GenerativeModel(
-                model_name=self.prescription_model,
-                generation_config={
-                    "max_output_tokens": 8192,
-                    "temperature": 0,
-                    "top_p": 0.95
-                }
-            )
-            
-            # Prepare file data for Gemini
-            file_data = {
-                "mime_type": request.file.mimetype,
-                "data": base64_data
-            }
-            
-            # Generate content
-            response = await self._generate_content_async(model, file_data, self.prescription_prompt)
-            
+
+            if isinstance(response, BaseException):
+                raise response
+
             # Parse JSON response
-            json_string = response.replace('```json', '').replace('```', '').strip()
-            parsed_json = json.loads(json_string)
+            json_string = _extract_json(response)
+            parsed_json = orjson.loads(json_string)
             
             # Validate prescription data
             validated_data = self.validation_service.validate_prescription_data(parsed_json)
             
             # Return AI processing result (no DB operations)
-            ai_result = AIProcessingResult(
+            # model_construct: trusted internal data - skip re-validation
+            ai_result = AIProcessingResult.model_construct(
                 validated_data=validated_data,
                 file_url=file_url,
                 is_handwritten_rx=is_handwritten_rx,
                 is_voice_rx=is_voice_rx
             )
-            
-            return ComprehendResponse(
+
+            return ComprehendResponse.model_construct(
                 success=True,
-                processing_time=int((time.time() - start_time) * 1000),
-                ai_result=ai_result
+                processing_time=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                ai_result=ai_result,
+                error=None
             )
             
         except Exception as e:
-            logger.error(f"Error in AI processing: {str(e)}")
-            return ComprehendResponse(
+            logger.error("Error in AI processing: %s", str(e))
+            return ComprehendResponse.model_construct(
                 success=False,
-                processing_time=int((time.time() - start_time) * 1000),
-                error=ErrorDetails(
+                processing_time=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                ai_result=None,
+                error=ErrorDetails.model_construct(
                     message=str(e),
                     type=type(e).__name__,
                     context={
@@ -158,27 +271,20 @@ class ComprehendService:
         Main NestJS backend handles DB save and error logging
         """
         try:
-            # Process file data
+            # Process file data - bill processing never uploads to Firebase,
+            # so only the base64 form is ever needed
             if isinstance(request.file, bytes):
-                file_content = request.file
-                base64_data = base64.b64encode(file_content).decode('utf-8')
+                if len(request.file) > _B64_OFFLOAD_MIN:
+                    encoded = await asyncio.to_thread(base64.b64encode, request.file)
+                else:
+                    encoded = base64.b64encode(memoryview(request.file))
+                base64_data = encoded.decode('ascii')
             else:
                 base64_data = request.file
-                file_content = base64.b64decode(base64_data)
 
             if not request.mimetype.startswith('image/'):
                 raise ValueError("Unsupported file type for supplier bill processing")
             
-            # Process with Gemini AI
-            model = genai.GenerativeModel(
-                model_name=self.bill_model,
-                generation_config={
-                    "max_output_tokens": 8192,
-                    "temperature": 0,
-                    "top_p": 0.95
-                }
-            )
-            
             # Prepare file data for Gemini
             file_data = {
                 "mime_type": request.mimetype,
@@ -186,26 +292,29 @@ class ComprehendService:
             }
             
             # Generate content
-            response = await self._generate_content_async(model, file_data, self.bill_prompt)
+            response = await self._generate_content_async(self._bill_model, file_data, self._bill_prompt_part)
             
             # Parse JSON response
-            json_string = response.replace('```json', '').replace('```', '').strip()
-            parsed_json = json.loads(json_string)
+            json_string = _extract_json(response)
+            parsed_json = orjson.loads(json_string)
             
             # Validate supplier bill data
             validated_data = self.validation_service.validate_supplier_bill_data(parsed_json)
             
             # Return AI processing result (no DB operations, no file upload)
-            return BillResponse(
+            # model_construct: trusted internal data - skip re-validation
+            return BillResponse.model_construct(
                 success=True,
-                bill_result=validated_data
+                bill_result=validated_data,
+                error=None
             )
             
         except Exception as e:
-            logger.error(f"Error in supplier bill AI processing: {str(e)}")
-            return BillResponse(
+            logger.error("Error in supplier bill AI processing: %s", str(e))
+            return BillResponse.model_construct(
                 success=False,
-                error=ErrorDetails(
+                bill_result=None,
+                error=ErrorDetails.model_construct(
                     message=str(e),
                     type=type(e).__name__,
                     context={
@@ -217,23 +326,39 @@ class ComprehendService:
                 )
             )
     
-    async def _generate_content_async(self, model, file_data, prompt_text):
+    async def _generate_content_via_files_api(self, model, file_content, mime_type, prompt_part):
+        """Generate content for large payloads via the Gemini Files API"""
+        try:
+            # upload_file streams the raw bytes; the blocking call runs in a
+            # worker thread so the event loop stays free
+            uploaded = await asyncio.to_thread(
+                genai.upload_file, io.BytesIO(file_content), mime_type=mime_type
+            )
+            response = await model.generate_content_async([uploaded, prompt_part])
+            return response.text
+
+        except Exception as e:
+            logger.error("Error generating content via Files API: %s", str(e))
+            raise
+
+    async def _generate_content_async(self, model, file_data, prompt_part):
         """Generate content using Gemini AI asynchronously"""
         try:
-            # Create the content parts
+            # Create the content parts - the prompt Part is prebuilt, only
+            # the inline file part is allocated per call
             parts = [
                 {
                     "inline_data": file_data
                 },
-                {
-                    "text": prompt_text
-                }
+                prompt_part
             ]
             
-            # Generate content
-            response = model.generate_content(parts)
+            # Generate content via the SDK's native async API - the blocking
+            # generate_content call would freeze the event loop for the whole
+            # Gemini latency under concurrent load
+            response = await model.generate_content_async(parts)
             return response.text
             
         except Exception as e:
-            logger.error(f"Error generating content with Gemini: {str(e)}")
+            logger.error("Error generating content with Gemini: %s", str(e))
             raise 
\ No newline at end of file
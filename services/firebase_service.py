@@ -1,50 +1,178 @@
+import io
 import os
-import json
 import logging
 from typing import Dict, Any
+import orjson
 import firebase_admin
 from firebase_admin import credentials, storage
+from google.auth.transport.requests import AuthorizedSession
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from google.cloud import storage as gcs
+from requests.adapters import HTTPAdapter
 import asyncio
+import functools
+import threading
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+try:
+    import aiohttp
+    _AIOHTTP_AVAILABLE = True
+except ImportError:
+    # The executor-based upload path still works without aiohttp
+    _AIOHTTP_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-class FirebaseService:
-    def __init__(self):
-        self.bucket = None
-        self.executor = ThreadPoolExecutor(max_workers=3)
-        self._initialize_firebase()
-    
-    def _initialize_firebase(self):
-        """Initialize Firebase Admin SDK"""
-        try:
-            # Check if Firebase is already initialized
+# functools.cache does not serialize concurrent first calls, so the one-time
+# SDK init below takes this lock - on a cold start with several in-flight
+# uploads, two threads could otherwise both see no app and both call
+# initialize_app, and the loser would raise.
+_firebase_init_lock = threading.Lock()
+
+# GCS JSON API media-upload endpoint - a direct PUT here with aiohttp does
+# real async IO, no thread hop and no GIL contention under concurrent uploads
+_GCS_UPLOAD_URL = "https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o?uploadType=media&name={name}"
+
+# Firebase init (disk IO, JSON parse, SDK setup) and the upload executor are
+# cached at module level so they happen once per process no matter how many
+# FirebaseService instances get constructed, and only on first real use.
+
+@functools.cache
+def _shared_executor() -> ThreadPoolExecutor:
+    # Workers block on HTTPS round-trips, not CPU, so a wider pool lets
+    # concurrent uploads overlap instead of queueing behind each other
+    max_workers = int(os.getenv("FIREBASE_UPLOAD_WORKERS", 16))
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+@functools.cache
+def _get_bucket():
+    """Initialize Firebase Admin SDK once and return the bucket handle"""
+    try:
+        # Check if Firebase is already initialized - re-checked under the
+        # lock so exactly one thread performs the init
+        with _firebase_init_lock:
             if not firebase_admin._apps:
                 # Try to load service account key
                 service_account_path = os.path.join(os.getcwd(), "serviceAccountKey.json")
-                
+
                 if os.path.exists(service_account_path):
                     cred = credentials.Certificate(service_account_path)
                 else:
                     # Try environment variable for service account JSON
                     service_account_json = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
                     if service_account_json:
-                        service_account_dict = json.loads(service_account_json)
+                        service_account_dict = orjson.loads(service_account_json)
                         cred = credentials.Certificate(service_account_dict)
                     else:
                         raise ValueError("Firebase service account key not found")
-                
+
                 firebase_admin.initialize_app(cred, {
                     'storageBucket': os.getenv("FIREBASE_STORAGE_BUCKET")
                 })
-            
-            self.bucket = storage.bucket()
-            logger.info("Firebase initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Firebase: {str(e)}")
-            raise ValueError(f"Firebase initialization failed: {str(e)}")
-    
+
+        bucket = _build_pooled_bucket()
+        logger.info("Firebase initialized successfully")
+        return bucket
+
+    except Exception as e:
+        logger.error(f"Failed to initialize Firebase: {str(e)}")
+        raise ValueError(f"Firebase initialization failed: {str(e)}")
+
+def _build_pooled_bucket():
+    """Build a bucket handle backed by one pooled authenticated session.
+
+    The default client may re-do the TCP+TLS handshake per upload; a
+    mounted connection pool reuses sessions across the executor workers,
+    which is most of the latency for small prescription files.
+    """
+    try:
+        google_cred = firebase_admin.get_app().credential.get_credential()
+        session = AuthorizedSession(google_cred)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount("https://", adapter)
+
+        client = gcs.Client(
+            project=getattr(google_cred, "project_id", None),
+            credentials=google_cred,
+            _http=session
+        )
+        return client.bucket(os.getenv("FIREBASE_STORAGE_BUCKET"))
+
+    except Exception as e:
+        # The default bucket still works without pooling - don't take the
+        # service down over a transport optimization
+        logger.warning("Falling back to default storage client: %s", str(e))
+        return storage.bucket()
+
+@functools.cache
+def _public_base_url() -> str:
+    # Public-bucket URLs are deterministic - compute the base once so uploads
+    # can build them without any ACL round-trip
+    return f"https://storage.googleapis.com/{_get_bucket().name}"
+
+class FirebaseService:
+    def __init__(self, public_bucket: bool = True):
+        self.public_bucket = public_bucket
+        self.executor = _shared_executor()
+        self._session = None  # aiohttp session, created lazily on the loop
+
+    @property
+    def bucket(self):
+        # Lazy: the SDK initializes on first upload, once per process
+        return _get_bucket()
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def aclose(self):
+        """Close the shared aiohttp session; called at application shutdown"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _upload_file_async(
+        self,
+        file_content: bytes,
+        file_path: str,
+        content_type: str
+    ) -> Dict[str, Any]:
+        """Upload via the raw GCS JSON API with aiohttp - no executor hop.
+
+        Only used for public buckets, where the resulting URL is
+        deterministic; non-public buckets need the SDK's ACL handling.
+        """
+        # _get_bucket() performs the one-time Firebase app init, so it must
+        # run before get_app(); the bucket name is needed for the URL anyway
+        bucket_name = _get_bucket().name
+
+        # google-auth caches the token on the credential until expiry, so the
+        # refresh (a blocking HTTP call) only hits a worker thread when stale
+        google_cred = firebase_admin.get_app().credential.get_credential()
+        if not google_cred.valid:
+            await asyncio.to_thread(google_cred.refresh, GoogleAuthRequest())
+
+        session = await self._get_session()
+        url = _GCS_UPLOAD_URL.format(bucket=bucket_name, name=quote(file_path, safe=''))
+
+        async with session.post(
+            url,
+            data=file_content,
+            headers={
+                "Authorization": f"Bearer {google_cred.token}",
+                "Content-Type": content_type
+            }
+        ) as resp:
+            if resp.status != 200:
+                body = await resp.text()
+                raise RuntimeError(f"GCS upload returned {resp.status}: {body[:200]}")
+
+        return {
+            "success": True,
+            "url": f"{_public_base_url()}/{quote(file_path)}"
+        }
+
     async def upload_file(
         self, 
         file_content: bytes, 
@@ -53,6 +181,12 @@ class FirebaseService:
         original_name: str
     ) -> Dict[str, Any]:
         """Upload file to Firebase Storage asynchronously"""
+        if _AIOHTTP_AVAILABLE and self.public_bucket:
+            try:
+                return await self._upload_file_async(file_content, file_path, content_type)
+            except Exception as e:
+                logger.warning("Async upload failed, falling back to executor path: %s", str(e))
+
         try:
             # Run the upload in a thread executor to avoid blocking
             result = await asyncio.get_event_loop().run_in_executor(
@@ -77,6 +211,31 @@ class FirebaseService:
                 }
             }
     
+    async def upload_files(self, items) -> list:
+        """Upload multiple files to Firebase Storage concurrently.
+
+        Each item is a (file_content, file_path, content_type, original_name)
+        tuple. N small uploads complete in roughly max(RTT) instead of
+        serialising through one call at a time.
+        """
+        loop = asyncio.get_event_loop()
+        tasks = [
+            loop.run_in_executor(self.executor, self._upload_file_sync, *item)
+            for item in items
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # _upload_file_sync reports failures as dicts; mirror that for any
+        # exception that escaped the executor so callers see one shape
+        return [
+            result if not isinstance(result, BaseException) else {
+                "success": False,
+                "error": str(result),
+                "details": {"error_type": type(result).__name__}
+            }
+            for result in results
+        ]
+
     def _upload_file_sync(
         self, 
         file_content: bytes, 
@@ -87,13 +246,31 @@ class FirebaseService:
         """Synchronous file upload to Firebase Storage"""
         try:
             blob = self.bucket.blob(file_path)
-            
-            # Upload the file
-            blob.upload_from_string(
-                file_content,
-                content_type=content_type
+
+            # Single-shot PUT: chunk_size=None avoids a resumable upload
+            # session for prescription-sized files and upload_from_file skips
+            # the bytes re-wrap upload_from_string does internally. crc32c
+            # keeps end-to-end integrity checking but hashes via the
+            # hardware-accelerated google-crc32c extension instead of the
+            # default MD5 pass; if_generation_match=None skips the
+            # precondition-building branch in the SDK.
+            blob.chunk_size = None
+            blob.upload_from_file(
+                io.BytesIO(file_content),
+                size=len(file_content),
+                content_type=content_type,
+                checksum="crc32c",
+                if_generation_match=None
             )
             
+            if self.public_bucket:
+                # The object is readable as soon as the upload lands; skipping
+                # make_public saves a full round-trip per file
+                return {
+                    "success": True,
+                    "url": f"{_public_base_url()}/{quote(file_path)}"
+                }
+
             # Try to make the file public
             try:
                 blob.make_public()
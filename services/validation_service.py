@@ -1,333 +1,454 @@
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, List
-from models.dto import MedicationDto, FoodDto, FrequencyDto, TaperingDto, SupplierDto, BuyFromSupplierMedicineDto, SupplierBillDto
+from models.dto import MedicationDto, SupplierDto, BuyFromSupplierMedicineDto, SupplierBillDto
 
 logger = logging.getLogger(__name__)
 
+# Default structures live at module scope so every instance shares one copy,
+# and the read-only MappingProxyType wrappers guard against accidental
+# mutation. Hot paths merge with .copy() + .update(), which skips the
+# intermediate dict that a {**a, **b} splat builds.
+
+_FOOD_DEFAULTS = {
+    "before_breakfast": False,
+    "after_breakfast": False,
+    "lunch": False,
+    "dinner": False
+}
+
+_FREQUENCY_DEFAULTS = {
+    "od": False,
+    "bid": False,
+    "tid": False,
+    "qid": False,
+    "hs": False,
+    "ac": False,
+    "pc": False,
+    "qam": False,
+    "qpm": False,
+    "bs": False,
+    "q6h": False,
+    "q8h": False,
+    "q12h": False,
+    "qod": False,
+    "q1w": False,
+    "q2w": False,
+    "q3w": False,
+    "q1m": False
+}
+
+_SUPPLIER_DEFAULTS = {
+    "name": "",
+    "gst_number": "",
+    "address_line1": "",
+    "address_line2": "",
+    "city": "",
+    "state": "",
+    # Clinic contact info
+    "phone": "",
+    "email": "",
+    # Contact person info
+    "contact_person_name": "",
+    "contact_person_phone": ""
+}
+
+_DEFAULT_PRESCRIPTION = MappingProxyType({
+    "diagnosis": "",
+    "history": "",
+    "name": "",
+    "age": 0,
+    "sex": "",
+    "medication": [],
+    "test_suggested": "",
+    "test_results": "",
+    "medical_notes": "",
+    "followUp": None
+})
+
+_DEFAULT_FOOD = MappingProxyType(_FOOD_DEFAULTS)
+
+_DEFAULT_FREQUENCY = MappingProxyType(_FREQUENCY_DEFAULTS)
+
+_DEFAULT_MEDICATION = MappingProxyType({
+    "medicine_name": "",
+    "dosage": "",
+    "days": 0,
+    "is_sos": False,
+    "food": _FOOD_DEFAULTS,
+    "frequency": _FREQUENCY_DEFAULTS,
+    "tapering": None
+})
+
+_DEFAULT_TAPERING = MappingProxyType({
+    "frequency": "",
+    "days": 0,
+    "comments": ""
+})
+
+_DEFAULT_SUPPLIER = MappingProxyType(_SUPPLIER_DEFAULTS)
+
+_DEFAULT_SUPPLIER_BILL = MappingProxyType({
+    "supplier": _SUPPLIER_DEFAULTS,
+    "bill_number": "",
+    "medicines": []
+})
+
+# Key sets for the conformant-input fast path in _validate_medication
+_MED_KEYS = frozenset(_DEFAULT_MEDICATION)
+_FOOD_KEYS = frozenset(_FOOD_DEFAULTS)
+_FREQUENCY_KEYS = frozenset(_FREQUENCY_DEFAULTS)
+
+_DEFAULT_SUPPLIER_MEDICINE = MappingProxyType({
+    "medicine_name": "",
+    "dosage": "",
+    "quantity": 0,
+    "mrp": 0.0,
+    "buying_price": 0.0,
+    "selling_price": 0.0,
+    "expiry_date": "",
+    "batch_number": "",
+    "manufacturer": ""
+})
+
+# Coercers with a fast path for the type the JSON decoder already produced -
+# by far the common case - so most fields never enter a try block
+
+def _to_str(v) -> str:
+    if type(v) is str:
+        return v
+    return str(v) if v else ""
+
+def _to_int(v) -> int:
+    if type(v) is int:
+        return v
+    try:
+        return int(v) if v else 0
+    except (ValueError, TypeError):
+        return 0
+
+def _to_float(v) -> float:
+    if type(v) is float:
+        return v
+    # The JSON decoder yields int for whole-number prices; widen without a try
+    if type(v) is int:
+        return float(v)
+    try:
+        return float(v) if v else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+# Gemini emits the same handful of food/frequency patterns over and over
+# (all-False, od=True, bid=True, ...), so the merged dicts are memoized by
+# their items. Cached results are shared across medications and treated as
+# read-only downstream - they flow straight into the response JSON.
+
+@lru_cache(maxsize=256)
+def _merged_food(items) -> Dict[str, Any]:
+    merged = _DEFAULT_FOOD.copy()
+    merged.update(items)
+    return merged
+
+@lru_cache(maxsize=256)
+def _merged_frequency(items) -> Dict[str, Any]:
+    merged = _DEFAULT_FREQUENCY.copy()
+    merged.update(items)
+    return merged
+
+# Fallback DTOs for the error paths, built once at import - the except
+# branches fire on malformed data, and rebuilding identical empty DTOs there
+# was pure allocation. Shared and never mutated.
+_EMPTY_MEDICATION_DTO = MedicationDto.model_construct(
+    medicine_name="",
+    dosage="",
+    days=0,
+    is_sos=False,
+    food=dict(_FOOD_DEFAULTS),
+    frequency=dict(_FREQUENCY_DEFAULTS),
+    tapering=None
+)
+
+_EMPTY_SUPPLIER_BILL_DTO = SupplierBillDto.model_construct(
+    supplier=SupplierDto.model_construct(name=""),
+    bill_number="",
+    medicines=[]
+)
+
 class ValidationService:
-    def __init__(self):
-        self.default_prescription = {
-            "diagnosis": "",
-            "history": "",
-            "name": "",
-            "age": 0,
-            "sex": "",
-            "medication": [],
-            "test_suggested": "",
-            "test_results": "",
-            "medical_notes": "",
-            "followUp": None
-        }
-        
-        self.default_medication = {
-            "medicine_name": "",
-            "dosage": "",
-            "days": 0,
-            "is_sos": False,
-            "food": {
-                "before_breakfast": False,
-                "after_breakfast": False,
-                "lunch": False,
-                "dinner": False
-            },
-            "frequency": {
-                "od": False,
-                "bid": False,
-                "tid": False,
-                "qid": False,
-                "hs": False,
-                "ac": False,
-                "pc": False,
-                "qam": False,
-                "qpm": False,
-                "bs": False,
-                "q6h": False,
-                "q8h": False,
-                "q12h": False,
-                "qod": False,
-                "q1w": False,
-                "q2w": False,
-                "q3w": False,
-                "q1m": False
-            },
-            "tapering": None
-        }
-        
-        self.default_tapering = {
-            "frequency": "",
-            "days": 0,
-            "comments": ""
-        }
-
-        # Default supplier bill structure
-        self.default_supplier_bill = {
-            "supplier": {
-                "name": "",
-                "gst_number": "",
-                "address_line1": "",
-                "address_line2": "",
-                "city": "",
-                "state": "",
-                "contact_person_name": "",
-                "phone": "",
-                "email": ""
-            },
-            "bill_number": "",
-            "medicines": []
-        }
-
-        # Default supplier medicine structure
-        self.default_supplier_medicine = {
-            "medicine_name": "",
-            "dosage": "",
-            "quantity": 0,
-            "mrp": 0.0,
-            "buying_price": 0.0,
-            "selling_price": 0.0,
-            "expiry_date": "",
-            "batch_number": "",
-            "manufacturer": ""
-        }
-
-        self.default_supplier = {
-            "name": "",
-            "gst_number": "",
-            "address_line1": "",
-            "address_line2": "",
-            "city": "",
-            "state": "",
-            # Clinic contact info
-            "phone": "",
-            "email": "",
-            # Contact person info
-            "contact_person_name": "",
-            "contact_person_phone": ""
-        }
-    
+    # (field, coercer) tables - one loop per payload instead of a block of
+    # near-identical try/excepts per field
+    _PRESCRIPTION_STR_FIELDS = ("diagnosis", "history", "name", "sex", "test_suggested", "test_results", "medical_notes")
+    _SUPPLIER_STR_FIELDS = ("name", "gst_number", "address_line1", "address_line2", "city", "state", "phone", "email", "contact_person_name", "contact_person_phone")
+    _SUPPLIER_MEDICINE_STR_FIELDS = ("medicine_name", "dosage", "expiry_date", "batch_number", "manufacturer")
+    _SUPPLIER_MEDICINE_FLOAT_FIELDS = ("mrp", "buying_price", "selling_price")
+
     def validate_prescription_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and apply defaults to prescription data"""
         try:
             # Apply prescription-level defaults
-            validated_data = {**self.default_prescription, **data}
-            
-            # Validate and process medication array
-            medications = data.get("medication", [])
-            validated_medications = []
-            
-            for med in medications:
-                validated_med = self._validate_medication(med)
-                validated_medications.append(validated_med)
-            
-            validated_data["medication"] = validated_medications
-            
+            validated_data = _DEFAULT_PRESCRIPTION.copy()
+            validated_data.update(data)
+
+            # Validate and process medication array - bound method in a local
+            # keeps the attribute lookup out of the loop
+            _vm = self._validate_medication
+            validated_data["medication"] = [_vm(med) for med in data.get("medication", [])]
+
             # Ensure age is an integer
-            try:
-                validated_data["age"] = int(validated_data["age"]) if validated_data["age"] else 0
-            except (ValueError, TypeError):
-                validated_data["age"] = 0
-            
+            validated_data["age"] = _to_int(validated_data["age"])
+
             # Ensure required string fields are strings
-            for field in ["diagnosis", "history", "name", "sex", "test_suggested", "test_results", "medical_notes"]:
-                if not isinstance(validated_data[field], str):
-                    validated_data[field] = str(validated_data[field]) if validated_data[field] is not None else ""
-            
+            for field in self._PRESCRIPTION_STR_FIELDS:
+                validated_data[field] = _to_str(validated_data[field])
+
             return validated_data
-            
+
         except Exception as e:
             logger.error(f"Error validating prescription data: {str(e)}")
             # Return default data structure if validation fails
-            return self.default_prescription.copy()
-    
+            return _DEFAULT_PRESCRIPTION.copy()
+
     def _validate_medication(self, med_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate individual medication data"""
-        try:
-            # Apply medication defaults
-            validated_med = {**self.default_medication, **med_data}
-            
-            # Validate food data
-            food_data = med_data.get("food", {})
-            validated_med["food"] = {**self.default_medication["food"], **food_data}
-            
-            # Validate frequency data
-            frequency_data = med_data.get("frequency", {})
-            validated_med["frequency"] = {**self.default_medication["frequency"], **frequency_data}
-            
-            # Validate tapering data
-            tapering_data = med_data.get("tapering")
-            if tapering_data and isinstance(tapering_data, list) and len(tapering_data) > 0:
-                validated_tapering = []
-                for tap in tapering_data:
-                    validated_tap = {**self.default_tapering, **tap}
-                    # Ensure frequency is a string
-                    if not isinstance(validated_tap["frequency"], str):
-                        validated_tap["frequency"] = ""
-                    validated_tapering.append(validated_tap)
-                validated_med["tapering"] = validated_tapering
-            else:
-                validated_med["tapering"] = None
-            
-            # Ensure required fields are correct types
-            validated_med["medicine_name"] = str(validated_med["medicine_name"]) if validated_med["medicine_name"] else ""
-            validated_med["dosage"] = str(validated_med["dosage"]) if validated_med["dosage"] else ""
-            
+        # One type guard up front replaces the old blanket try/except - the
+        # remaining operations below cannot raise, so the interpreter skips
+        # the exception-frame setup per medication
+        if type(med_data) is not dict:
+            return _DEFAULT_MEDICATION.copy()
+
+        # Gemini usually emits a fully-formed medication; a handful of shape
+        # checks proves the dict already satisfies everything the merge below
+        # would establish (all keys present, required fields typed, food and
+        # frequency complete), so it can be returned untouched. Medications
+        # with tapering take the full path - the entries need per-item fixes.
+        if (
+            _MED_KEYS.issubset(med_data.keys())
+            and type(med_data["medicine_name"]) is str
+            and type(med_data["dosage"]) is str
+            and type(med_data["days"]) is int
+            and type(med_data["is_sos"]) is bool
+            and type(med_data["food"]) is dict
+            and _FOOD_KEYS.issubset(med_data["food"].keys())
+            and type(med_data["frequency"]) is dict
+            and _FREQUENCY_KEYS.issubset(med_data["frequency"].keys())
+            and med_data["tapering"] is None
+        ):
+            return med_data
+
+        # Apply medication defaults
+        validated_med = _DEFAULT_MEDICATION.copy()
+        validated_med.update(med_data)
+
+        # Validate food data
+        food_data = med_data.get("food")
+        if type(food_data) is dict:
             try:
-                validated_med["days"] = int(validated_med["days"]) if validated_med["days"] else 0
-            except (ValueError, TypeError):
-                validated_med["days"] = 0
-            
-            validated_med["is_sos"] = bool(validated_med["is_sos"])
-            
-            return validated_med
-            
-        except Exception as e:
-            logger.error(f"Error validating medication: {str(e)}")
-            return self.default_medication.copy()
+                validated_med["food"] = _merged_food(frozenset(food_data.items()))
+            except TypeError:
+                # Unhashable value - fall back to an uncached merge
+                food = _DEFAULT_FOOD.copy()
+                food.update(food_data)
+                validated_med["food"] = food
+        else:
+            validated_med["food"] = _DEFAULT_FOOD.copy()
+
+        # Validate frequency data
+        frequency_data = med_data.get("frequency")
+        if type(frequency_data) is dict:
+            try:
+                validated_med["frequency"] = _merged_frequency(frozenset(frequency_data.items()))
+            except TypeError:
+                frequency = _DEFAULT_FREQUENCY.copy()
+                frequency.update(frequency_data)
+                validated_med["frequency"] = frequency
+        else:
+            validated_med["frequency"] = _DEFAULT_FREQUENCY.copy()
+
+        # Validate tapering data
+        tapering_data = med_data.get("tapering")
+        validated_med["tapering"] = None
+        if tapering_data and isinstance(tapering_data, list):
+            validated_tapering = []
+            for tap in tapering_data:
+                if type(tap) is not dict:
+                    continue
+                validated_tap = _DEFAULT_TAPERING.copy()
+                validated_tap.update(tap)
+                # Ensure frequency is a string
+                if not isinstance(validated_tap["frequency"], str):
+                    validated_tap["frequency"] = ""
+                validated_tapering.append(validated_tap)
+            if validated_tapering:
+                validated_med["tapering"] = validated_tapering
+
+        # Ensure required fields are correct types
+        validated_med["medicine_name"] = _to_str(validated_med["medicine_name"])
+        validated_med["dosage"] = _to_str(validated_med["dosage"])
+        validated_med["days"] = _to_int(validated_med["days"])
+        validated_med["is_sos"] = bool(validated_med["is_sos"])
+
+        return validated_med
 
     def validate_supplier_bill_data(self, data: Dict[str, Any]) -> SupplierBillDto:
         """Validate and apply defaults to supplier bill data"""
         try:
             # Apply supplier bill-level defaults
-            validated_data = {**self.default_supplier_bill, **data}
-            
+            validated_data = _DEFAULT_SUPPLIER_BILL.copy()
+            validated_data.update(data)
+
             # Validate supplier data
             supplier_data = data.get("supplier", {})
             validated_data["supplier"] = self._validate_supplier(supplier_data)
-            
+
             # Validate and process medicines array
-            medicines = data.get("medicines", [])
-            validated_medicines = []
-            
-            for med in medicines:
-                validated_med = self._validate_supplier_medicine(med)
-                validated_medicines.append(validated_med)
-            
-            validated_data["medicines"] = validated_medicines
-            
+            _vm = self._validate_supplier_medicine
+            validated_data["medicines"] = [_vm(med) for med in data.get("medicines", [])]
+
             # Ensure required string fields are strings
-            validated_data["bill_number"] = str(validated_data["bill_number"]) if validated_data["bill_number"] else ""
-            
+            validated_data["bill_number"] = _to_str(validated_data["bill_number"])
+
             # Create and return the DTO
             return self.create_supplier_bill_dto(validated_data)
-            
+
         except Exception as e:
             logger.error(f"Error validating supplier bill data: {str(e)}")
             # Return default data structure if validation fails
-            return self.create_supplier_bill_dto(self.default_supplier_bill.copy())
-    
+            return self.create_supplier_bill_dto(_DEFAULT_SUPPLIER_BILL.copy())
+
     def _validate_supplier_medicine(self, med_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate individual supplier medicine data"""
-        try:
-            # Apply medicine defaults
-            validated_med = {**self.default_supplier_medicine, **med_data}
-            
-            # Ensure required fields are correct types
-            validated_med["medicine_name"] = str(validated_med["medicine_name"]) if validated_med["medicine_name"] else ""
-            validated_med["dosage"] = str(validated_med["dosage"]) if validated_med["dosage"] else ""
-            validated_med["expiry_date"] = str(validated_med["expiry_date"]) if validated_med["expiry_date"] else ""
-            
-            try:
-                validated_med["quantity"] = int(validated_med["quantity"]) if validated_med["quantity"] else 0
-            except (ValueError, TypeError):
-                validated_med["quantity"] = 0
-            
-            try:
-                validated_med["mrp"] = float(validated_med["mrp"]) if validated_med["mrp"] else 0.0
-            except (ValueError, TypeError):
-                validated_med["mrp"] = 0.0
-            
-            try:
-                validated_med["buying_price"] = float(validated_med["buying_price"]) if validated_med["buying_price"] else 0.0
-            except (ValueError, TypeError):
-                validated_med["buying_price"] = 0.0
-            
-            try:
-                validated_med["selling_price"] = float(validated_med["selling_price"]) if validated_med["selling_price"] else 0.0
-            except (ValueError, TypeError):
-                validated_med["selling_price"] = 0.0
-            
-            # Set selling_price equal to mrp if not provided
-            if validated_med["selling_price"] == 0.0 and validated_med["mrp"] > 0.0:
-                validated_med["selling_price"] = validated_med["mrp"]
-            
-            validated_med["batch_number"] = str(validated_med["batch_number"]) if validated_med["batch_number"] else ""
-            validated_med["manufacturer"] = str(validated_med["manufacturer"]) if validated_med["manufacturer"] else ""
-            
-            return validated_med
-            
-        except Exception as e:
-            logger.error(f"Error validating supplier medicine: {str(e)}")
-            return self.default_supplier_medicine.copy()
+        if type(med_data) is not dict:
+            return _DEFAULT_SUPPLIER_MEDICINE.copy()
+
+        # Apply medicine defaults
+        validated_med = _DEFAULT_SUPPLIER_MEDICINE.copy()
+        validated_med.update(med_data)
+
+        # Ensure required fields are correct types
+        for field in self._SUPPLIER_MEDICINE_STR_FIELDS:
+            validated_med[field] = _to_str(validated_med[field])
+        validated_med["quantity"] = _to_int(validated_med["quantity"])
+        for field in self._SUPPLIER_MEDICINE_FLOAT_FIELDS:
+            validated_med[field] = _to_float(validated_med[field])
+
+        # Set selling_price equal to mrp if not provided
+        if validated_med["selling_price"] == 0.0 and validated_med["mrp"] > 0.0:
+            validated_med["selling_price"] = validated_med["mrp"]
+
+        return validated_med
 
     def _validate_supplier(self, supplier_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate supplier data"""
-        try:
-            # Apply supplier defaults
-            validated_supplier = {**self.default_supplier, **supplier_data}
-            
-            # Ensure all fields are strings
-            for field in ["name", "gst_number", "address_line1", "address_line2", "city", "state", "phone", "email", "contact_person_name", "contact_person_phone"]:
-                if not isinstance(validated_supplier[field], str):
-                    validated_supplier[field] = str(validated_supplier[field]) if validated_supplier[field] is not None else ""
-            
-            return validated_supplier
-            
-        except Exception as e:
-            logger.error(f"Error validating supplier: {str(e)}")
-            return self.default_supplier.copy()
+        if type(supplier_data) is not dict:
+            return _DEFAULT_SUPPLIER.copy()
+
+        # Apply supplier defaults
+        validated_supplier = _DEFAULT_SUPPLIER.copy()
+        validated_supplier.update(supplier_data)
+
+        # Ensure all fields are strings
+        for field in self._SUPPLIER_STR_FIELDS:
+            validated_supplier[field] = _to_str(validated_supplier[field])
+
+        return validated_supplier
+
+    def validate_and_build_medication_dtos(self, medications: List[Dict[str, Any]]) -> List[MedicationDto]:
+        """Validate raw medication dicts and build DTOs in a single pass.
+
+        Fuses _validate_medication and create_medication_dto so no
+        intermediate validated dict is materialized per medication - the
+        coercion rules mirror _validate_medication exactly.
+        """
+        # Local aliases keep attribute lookups out of the hot loop
+        construct = MedicationDto.model_construct
+        dtos = []
+
+        for med_data in medications:
+            try:
+                food_data = med_data.get("food", {})
+                try:
+                    food = _merged_food(frozenset(food_data.items()))
+                except TypeError:
+                    food = _DEFAULT_FOOD.copy()
+                    food.update(food_data)
+
+                frequency_data = med_data.get("frequency", {})
+                try:
+                    frequency = _merged_frequency(frozenset(frequency_data.items()))
+                except TypeError:
+                    frequency = _DEFAULT_FREQUENCY.copy()
+                    frequency.update(frequency_data)
+
+                tapering_data = med_data.get("tapering")
+                if tapering_data and isinstance(tapering_data, list):
+                    tapering = []
+                    for tap in tapering_data:
+                        validated_tap = _DEFAULT_TAPERING.copy()
+                        validated_tap.update(tap)
+                        if not isinstance(validated_tap["frequency"], str):
+                            validated_tap["frequency"] = ""
+                        tapering.append(validated_tap)
+                else:
+                    tapering = None
+
+                dtos.append(construct(
+                    medicine_name=_to_str(med_data.get("medicine_name")),
+                    dosage=_to_str(med_data.get("dosage")),
+                    days=_to_int(med_data.get("days")),
+                    is_sos=bool(med_data.get("is_sos")),
+                    food=food,
+                    frequency=frequency,
+                    tapering=tapering
+                ))
+
+            except Exception as e:
+                logger.error(f"Error building MedicationDto: {str(e)}")
+                dtos.append(_EMPTY_MEDICATION_DTO)
+
+        return dtos
 
     def create_medication_dto(self, med_data: Dict[str, Any]) -> MedicationDto:
         """Create MedicationDto from validated data"""
         try:
-            food_dto = FoodDto(**med_data["food"])
-            frequency_dto = FrequencyDto(**med_data["frequency"])
-            
-            tapering_dtos = None
-            if med_data.get("tapering"):
-                tapering_dtos = [TaperingDto(**tap) for tap in med_data["tapering"]]
-            
-            return MedicationDto(
+            # med_data already went through _validate_medication, which merged
+            # defaults and coerced every field - a second pydantic validation
+            # pass here would just re-walk the same data
+            return MedicationDto.model_construct(
                 medicine_name=med_data["medicine_name"],
                 dosage=med_data["dosage"],
                 days=med_data["days"],
                 is_sos=med_data["is_sos"],
-                food=food_dto,
-                frequency=frequency_dto,
-                tapering=tapering_dtos,
-                original_name=med_data.get("original_name"),
-                rejected_matches=med_data.get("rejected_matches"),
-                no_match_found=med_data.get("no_match_found")
+                food=med_data["food"],
+                frequency=med_data["frequency"],
+                tapering=med_data["tapering"]
             )
-            
+
         except Exception as e:
             logger.error(f"Error creating MedicationDto: {str(e)}")
             # Return default medication DTO
-            return MedicationDto(
-                medicine_name="",
-                dosage="",
-                days=0,
-                is_sos=False,
-                food=FoodDto(),
-                frequency=FrequencyDto(),
-                tapering=None
-            )
+            return _EMPTY_MEDICATION_DTO
 
     def create_supplier_bill_dto(self, bill_data: Dict[str, Any]) -> SupplierBillDto:
         """Create SupplierBillDto from validated data"""
         try:
-            supplier_dto = SupplierDto(**bill_data["supplier"])
-            medicines_dtos = [BuyFromSupplierMedicineDto(**med) for med in bill_data["medicines"]]
-            
-            return SupplierBillDto(
+            # bill_data was already validated field-by-field above - build
+            # the DTOs without re-validating
+            supplier_dto = SupplierDto.model_construct(**bill_data["supplier"])
+            construct = BuyFromSupplierMedicineDto.model_construct
+            medicines_dtos = [construct(**med) for med in bill_data["medicines"]]
+
+            return SupplierBillDto.model_construct(
                 supplier=supplier_dto,
                 bill_number=bill_data["bill_number"],
                 medicines=medicines_dtos
             )
-            
+
         except Exception as e:
             logger.error(f"Error creating SupplierBillDto: {str(e)}")
             # Return default supplier bill DTO
-            return SupplierBillDto(
-                supplier=SupplierDto(name=""),
-                bill_number="",
-                medicines=[]
-            ) 
\ No newline at end of file
+            return _EMPTY_SUPPLIER_BILL_DTO
+
+# Shared instance - the service is stateless, so callers reuse one object
+# instead of constructing their own
+validation_service = ValidationService()